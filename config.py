@@ -30,18 +30,23 @@ DEFAULT_API_URL = (
 
 # ── Matching constants ────────────────────────────────────
 VALID_CONFIDENCE = {"Exact", "High", "Review", "None"}
+FUZZY_SCORE_CUTOFF = float(os.getenv("FUZZY_SCORE_CUTOFF", "90"))  # Stage 1.5 threshold
 
 # ── Retry / backoff ──────────────────────────────────────
 MAX_RETRIES = 3
-BACKOFF_BASE = 2          # seconds – exponential base
+BACKOFF_BASE = 2          # seconds – exponential base (429 / quota errors)
+BACKOFF_TRANSIENT_BASE = 0.2  # seconds – first retry for transient failures
 BACKOFF_MAX = 30          # seconds – cap per retry
 
 # ── LLM ──────────────────────────────────────────────────
 LLM_MODEL = "gpt-4o-mini"
 LLM_TEMPERATURE = 0.0
+LLM_CACHE_FILE = OUTPUT_DIR / "llm_cache.json"  # persistent cross-run result cache
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "10"))  # tracks per batched LLM call
 
-# ── Rate limiting ────────────────────────────────────────
+# ── Rate limiting / concurrency ──────────────────────────
 RATE_LIMIT_DELAY = float(os.getenv("RATE_LIMIT_DELAY", "0.1"))  # seconds between LLM calls
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "8"))        # concurrent LLM requests
 
 # ── Logging ───────────────────────────────────────────────
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
@@ -51,6 +56,27 @@ LOG_FILE_MAX_BYTES = 10 * 1024 * 1024   # 10 MB
 LOG_FILE_BACKUP_COUNT = 5
 
 
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler with a cheap rollover check.
+
+    The stock shouldRollover re-stats the log file on every emit, which
+    can account for a large share of logging CPU in chatty runs.  When
+    the stream position plus the formatted record is comfortably below
+    maxBytes, skip straight to "no rollover"; only fall back to the
+    full filesystem check near the threshold.
+    """
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is not None and self.maxBytes > 0:
+            try:
+                if self.stream.tell() + len(self.format(record)) + 2 < self.maxBytes:
+                    return False
+            except (OSError, ValueError):
+                pass
+        return super().shouldRollover(record)
+
+
 def setup_logging(level: int = logging.INFO) -> None:
     """
     Configure root logger with console output and optional file rotation.
@@ -62,7 +88,7 @@ def setup_logging(level: int = logging.INFO) -> None:
 
     if LOG_TO_FILE:
         LOG_DIR.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             LOG_DIR / "agent.log",
             maxBytes=LOG_FILE_MAX_BYTES,
             backupCount=LOG_FILE_BACKUP_COUNT,
@@ -5,16 +5,48 @@ All I/O and external calls live here so the matching logic stays pure.
 """
 
 import csv
+import io
 import json
 import logging
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Set
 
 import requests as http_requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # Optional fast path for large tour payloads
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    # Optional fast path: pandas' C parser is an order of magnitude
+    # faster than csv.DictReader once the catalog reaches thousands
+    # of rows.  The stdlib streaming path remains the fallback.
+    import pandas as pd
+except ImportError:
+    pd = None
 
 from config import DATA_DIR, DEFAULT_API_URL
 
 logger = logging.getLogger(__name__)
 
+# Module-level session: reuses pooled connections (saving a TCP+TLS
+# handshake per call after the first) and lets urllib3 retry transient
+# transport failures with backoff before our local fallback kicks in.
+_session = http_requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+    ),
+))
+_session.headers.update({"Accept-Encoding": "gzip"})
+
 
 # ── Tour data ─────────────────────────────────────────────
 
@@ -34,9 +66,9 @@ def fetch_tour_data(api_url: str = DEFAULT_API_URL) -> dict:
     if api_url:
         try:
             logger.info("Fetching tour data from API: %s", api_url)
-            response = http_requests.get(api_url, timeout=10)
+            response = _session.get(api_url, timeout=(3.05, 10))
             response.raise_for_status()
-            data = response.json()
+            data = _loads(response.content)
             logger.info("API response status: %s", data.get("status", "unknown"))
         except Exception as exc:
             logger.warning("API request failed: %s — falling back to local file", exc)
@@ -49,8 +81,8 @@ def fetch_tour_data(api_url: str = DEFAULT_API_URL) -> dict:
                 f"Tour data unavailable: API failed and local file not found at {local_path}"
             )
         logger.info("Loading tour data from local file: %s", local_path)
-        with open(local_path, "r") as f:
-            data = json.load(f)
+        with open(local_path, "rb") as f:
+            data = _loads(f.read())
 
     # Validate structure
     _validate_tour_data(data)
@@ -81,12 +113,60 @@ def _validate_tour_data(data: dict) -> None:
 REQUIRED_CATALOG_COLUMNS: Set[str] = {"catalog_id", "title", "writers", "controlled_percentage"}
 
 
+def _iter_cleaned_lines(f) -> Iterator[str]:
+    """
+    Yield non-empty catalog lines with the outer quote wrapper stripped.
+
+    Each row is wrapped in quotes (non-standard CSV format), e.g.
+    "CAT-001,Neon Dreams,Alex Park,100" → CAT-001,Neon Dreams,Alex Park,100.
+    Cleaning lazily keeps peak memory at one row instead of buffering
+    the whole file plus a cleaned copy.
+    """
+    for line in f:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        yield stripped.strip("'\"")
+
+
+def _load_catalog_pandas(file_path) -> List[Dict]:
+    """
+    Catalog loader backed by pandas' vectorized C parser.
+
+    The outer-quote wrapper still has to be stripped line by line, so
+    the cleaned text is buffered once and handed to read_csv; the
+    vectorized parse is what pays off as the catalog grows.  Produces
+    the same list-of-dicts as the stdlib path.
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        cleaned = "\n".join(_iter_cleaned_lines(f))
+
+    if not cleaned:
+        raise ValueError("Catalog file is empty")
+
+    df = pd.read_csv(io.StringIO(cleaned), dtype=str, engine="c").fillna("")
+
+    missing = REQUIRED_CATALOG_COLUMNS - set(df.columns)
+    if missing:
+        raise ValueError(f"Catalog CSV missing required columns: {missing}")
+
+    catalog = [
+        {k: v.strip() for k, v in row.items()} for row in df.to_dict("records")
+    ]
+    if not catalog:
+        raise ValueError("Catalog file contains no data rows")
+
+    logger.info("Loaded catalog: %d songs", len(catalog))
+    return catalog
+
+
 def load_catalog() -> List[Dict]:
     """
     Load the internal song catalog from CSV.
 
     Returns a list of dicts with catalog_id, title, writers,
-    controlled_percentage.
+    controlled_percentage.  Uses pandas when available; otherwise
+    streams the file with csv.DictReader.
 
     Raises:
         FileNotFoundError: If the catalog CSV does not exist.
@@ -96,37 +176,29 @@ def load_catalog() -> List[Dict]:
     if not file_path.exists():
         raise FileNotFoundError(f"Catalog file not found: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8-sig") as f:
-        raw_lines = f.readlines()
-
-    if not raw_lines:
-        raise ValueError("Catalog file is empty")
+    if pd is not None:
+        return _load_catalog_pandas(file_path)
 
-    # Strip outer quotes that wrap each row (non-standard CSV format)
-    # e.g. "CAT-001,Neon Dreams,Alex Park,100" → CAT-001,Neon Dreams,Alex Park,100
-    cleaned_lines = []
-    for line in raw_lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        cleaned_lines.append(stripped.strip("'\""))
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        # DictReader over the cleaning generator streams the file in a
+        # single pass (it handles commas in field values either way)
+        reader = csv.DictReader(_iter_cleaned_lines(f))
+        headers = reader.fieldnames or []
 
-    if not cleaned_lines:
-        raise ValueError("Catalog file contains no data rows")
+        if not headers:
+            raise ValueError("Catalog file is empty")
 
-    # Use csv.DictReader for robust parsing (handles commas in field values)
-    reader = csv.DictReader(cleaned_lines)
-    headers = reader.fieldnames or []
+        # Validate required columns
+        missing = REQUIRED_CATALOG_COLUMNS - set(headers)
+        if missing:
+            raise ValueError(f"Catalog CSV missing required columns: {missing}")
 
-    # Validate required columns
-    missing = REQUIRED_CATALOG_COLUMNS - set(headers)
-    if missing:
-        raise ValueError(f"Catalog CSV missing required columns: {missing}")
+        catalog: List[Dict] = [
+            {k: v.strip() for k, v in row.items()} for row in reader
+        ]
 
-    catalog: List[Dict] = []
-    for row in reader:
-        entry = {k: v.strip() for k, v in row.items()}
-        catalog.append(entry)
+    if not catalog:
+        raise ValueError("Catalog file contains no data rows")
 
     logger.info("Loaded catalog: %d songs", len(catalog))
     return catalog
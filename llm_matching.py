@@ -5,18 +5,34 @@ Handles abbreviations, medleys, and cover detection using OpenAI.
 Includes exponential backoff with jitter and an in-memory result cache.
 """
 
-import hashlib
+import asyncio
+import functools
 import json
 import logging
+import os
 import random
+import threading
 import time
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, RateLimitError
+
+try:
+    # Optional fast path: orjson parses ~3-5x faster than stdlib json.
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so the
+    # retry loops' except clauses work with either implementation.
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 from config import (
     BACKOFF_BASE,
     BACKOFF_MAX,
+    BACKOFF_TRANSIENT_BASE,
+    DATA_DIR,
+    LLM_CACHE_FILE,
+    LLM_MAX_WORKERS,
     LLM_MODEL,
     LLM_TEMPERATURE,
     MAX_RETRIES,
@@ -26,29 +42,261 @@ from matching import normalize, validate_match
 
 logger = logging.getLogger(__name__)
 
-# ── In-memory cache ──────────────────────────────────────
+# ── Result cache ─────────────────────────────────────────
 # Keyed on normalized track name so "Tokyo (Acoustic)" and
-# "Tokyo (Live)" both hit the same cache entry.
+# "Tokyo (Live)" both hit the same cache entry.  Guarded by
+# a lock since reconcile() fans calls out to worker threads.
+#
+# The cache is also persisted to LLM_CACHE_FILE (keys include
+# the model name so a model swap invalidates old entries), so
+# reruns skip API calls for previously seen tracks.  It is
+# loaded lazily on first use and saved explicitly by main()
+# so test runs with mocked clients never persist fake results.
 _match_cache: Dict[str, List[Dict]] = {}
+_cache_lock = threading.Lock()
+_cache_loaded = False
+
+# Sentinel reasonings for transient-failure fallbacks.  These entries
+# stay in the in-memory cache so one outage doesn't trigger a retry
+# storm within the run, but save_cache() filters them out — a transient
+# API failure must not permanently record a track as unmatched on disk.
+_RETRIES_EXHAUSTED = "retries exhausted"
+_MISSING_FROM_BATCH = "Missing from batch response"
+_UNPARSEABLE = "Unparseable response"
+_FAILURE_REASONS = frozenset({_RETRIES_EXHAUSTED, _MISSING_FROM_BATCH, _UNPARSEABLE})
+
+
+def _is_failure_fallback(matches: List[Dict]) -> bool:
+    """True if a cached result is a transient-failure fallback."""
+    return any(
+        isinstance(m, dict) and m.get("reasoning") in _FAILURE_REASONS
+        for m in matches
+    )
+
+# Caps the number of in-flight API requests so concurrent
+# workers can't exceed the provider's per-second quota.
+_rate_limiter = threading.BoundedSemaphore(LLM_MAX_WORKERS)
+
+
+class RateController:
+    """
+    Adaptive client-side rate limiter.
+
+    Keeps a sliding window of recent request outcomes and scales the
+    pre-call delay with the observed 429 rate: while the API accepts
+    everything the delay is zero, and when requests start bouncing the
+    spacing backs off smoothly instead of all workers hammering and
+    retrying in lockstep.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = RATE_LIMIT_DELAY,
+        window: float = 30.0,
+        max_events: int = 256,
+    ):
+        self._events: deque = deque()  # (monotonic timestamp, status code)
+        self._lock = threading.Lock()
+        self._base_delay = base_delay
+        self._window = window
+        self._max_events = max_events
+
+    def _prune(self, now: float) -> None:
+        """Drop events outside the window.  Caller holds the lock."""
+        events = self._events
+        while events and (
+            now - events[0][0] > self._window or len(events) > self._max_events
+        ):
+            events.popleft()
+
+    def record(self, status: int) -> None:
+        """Record a request outcome (e.g. 200 on success, 429 on limit)."""
+        now = time.monotonic()
+        with self._lock:
+            self._events.append((now, status))
+            self._prune(now)
+
+    def throttle_delay(self) -> float:
+        """Current pre-call delay, derived from the recent 429 rate."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            if not self._events:
+                return 0.0
+            rejected = sum(1 for _, status in self._events if status == 429)
+            if not rejected:
+                return 0.0
+            # Estimated admission probability → spacing that would have
+            # kept us under the limit, capped at the backoff ceiling.
+            admitted = (len(self._events) - rejected) / len(self._events)
+            return min(self._base_delay * (1.0 / max(admitted, 0.05)), BACKOFF_MAX)
+
+    def await_slot(self) -> None:
+        """Block until the controller admits the next request."""
+        delay = self.throttle_delay()
+        if delay > 0:
+            logger.info("Rate controller throttling %.2fs", delay)
+            time.sleep(delay)
+
+
+_rate_controller = RateController()
 
 
 def _cache_key(track_name: str) -> str:
     """Produce a stable cache key from a track name."""
-    return hashlib.sha256(normalize(track_name).encode()).hexdigest()
+    # The cache is in-process (and a plain JSON dict on disk), so the
+    # normalized name itself is the key — no need for a crypto hash,
+    # and identical normalized strings can never collide.
+    return f"{LLM_MODEL}:{normalize(track_name)}"
+
+
+def _load_cache() -> None:
+    """Load the persisted cache once, on first use.  Caller holds the lock."""
+    global _cache_loaded
+    if _cache_loaded:
+        return
+    _cache_loaded = True
+    if not LLM_CACHE_FILE.exists():
+        return
+    try:
+        with open(LLM_CACHE_FILE, "r", encoding="utf-8") as f:
+            persisted = json.load(f)
+        if isinstance(persisted, dict):
+            _match_cache.update(persisted)
+            logger.info(
+                "Loaded %d cached LLM results from %s", len(persisted), LLM_CACHE_FILE
+            )
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Could not load LLM cache from %s: %s", LLM_CACHE_FILE, exc)
+
+
+def save_cache() -> None:
+    """
+    Persist the LLM result cache to disk (atomic rewrite).
+
+    Called at the end of a pipeline run so subsequent runs skip
+    API calls for tracks that have already been matched.  Retry-
+    exhausted fallbacks are skipped — those tracks get a fresh
+    attempt on the next run.
+    """
+    with _cache_lock:
+        snapshot = {
+            key: matches
+            for key, matches in _match_cache.items()
+            if not _is_failure_fallback(matches)
+        }
+    try:
+        LLM_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = LLM_CACHE_FILE.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, LLM_CACHE_FILE)
+        logger.info("Saved %d LLM results to %s", len(snapshot), LLM_CACHE_FILE)
+    except OSError as exc:
+        logger.warning("Could not save LLM cache to %s: %s", LLM_CACHE_FILE, exc)
 
 
 def clear_cache() -> None:
-    """Clear the LLM result cache (useful between runs or in tests)."""
-    _match_cache.clear()
+    """
+    Clear the in-memory LLM result cache (useful between runs or in
+    tests).  Also marks the persisted cache as loaded so cleared
+    entries don't reappear from disk mid-run.
+    """
+    global _cache_loaded
+    with _cache_lock:
+        _match_cache.clear()
+        _cache_loaded = True
+
+
+# ── Known covers ─────────────────────────────────────────
+# Famous songs by other artists that tour setlists keep serving us.
+# The LLM flags them "not controlled" every single time, so a local
+# lookup answers for free what an API call would cost tokens to say.
+# Abbreviated or mangled spellings still go to the LLM.
 
+_KNOWN_COVERS_FILE = DATA_DIR / "known_covers.txt"
+_known_covers: Optional[frozenset] = None
 
-def _backoff_sleep(attempt: int) -> None:
+
+def _load_known_covers() -> frozenset:
+    """Load (once) the known-covers list as a frozenset of normalized titles."""
+    global _known_covers
+    if _known_covers is None:
+        titles = []
+        try:
+            with open(_KNOWN_COVERS_FILE, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        titles.append(normalize(line))
+        except OSError as exc:
+            logger.warning(
+                "Could not load known covers from %s: %s", _KNOWN_COVERS_FILE, exc
+            )
+        _known_covers = frozenset(titles)
+    return _known_covers
+
+
+def _known_cover_result(track_name: str) -> Optional[List[Dict]]:
+    """Return the not-controlled result if the track is a known cover."""
+    if normalize(track_name) in _load_known_covers():
+        logger.info("Known cover '%s' — skipping LLM call", track_name)
+        return [{"catalog_id": "None", "confidence": "None",
+                 "reasoning": "Known cover (local list)"}]
+    return None
+
+
+def _backoff_delay(attempt: int, rate_limited: bool = False) -> float:
+    """
+    Compute the backoff + jitter delay for an attempt.
+
+    429s use the full exponential schedule since the quota needs time
+    to recover.  Transient failures (5xx, timeouts, bad JSON) retry on
+    a much shorter bounded schedule — starting around 200ms instead of
+    1s — so a single blip doesn't dominate end-to-end latency.
+    """
+    if rate_limited:
+        return min(BACKOFF_BASE ** attempt + random.uniform(0, 1), BACKOFF_MAX)
+    return min(
+        BACKOFF_TRANSIENT_BASE * (2 ** attempt) + random.uniform(0, 0.2),
+        BACKOFF_MAX,
+    )
+
+
+def _backoff_sleep(attempt: int, rate_limited: bool = False) -> None:
     """Sleep with exponential backoff + jitter."""
-    delay = min(BACKOFF_BASE ** attempt + random.uniform(0, 1), BACKOFF_MAX)
+    delay = _backoff_delay(attempt, rate_limited)
     logger.info("Retrying in %.1fs (attempt %d)...", delay, attempt + 1)
     time.sleep(delay)
 
 
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """
+    Extract the server-hinted retry delay from a 429 response.
+
+    OpenAI sends "retry-after-ms" (milliseconds) and/or the standard
+    "retry-after" (seconds) header; honoring it lands the retry right
+    when the quota window resets instead of guessing with backoff.
+    Returns None when no usable hint is present.
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000.0
+        except (TypeError, ValueError):
+            pass
+    value = headers.get("retry-after")
+    if value is not None:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
 # ── Prompt construction ──────────────────────────────────
 
 SYSTEM_PROMPT = """You are a music catalog matching expert at a major music publisher.
@@ -73,12 +321,56 @@ CONFIDENCE LEVELS:
 Return ONLY valid JSON. No other text."""
 
 
-def _build_user_prompt(track_name: str, catalog: List[Dict]) -> str:
-    """Build the user prompt for the LLM call."""
-    catalog_list = "\n".join(
+# Rendered catalog block memoized per catalog object — the catalog is
+# constant for a run, so the O(M) string join happens once instead of
+# on every LLM call.  Each entry pins the catalog it was rendered
+# from: without the strong reference, id reuse after GC could silently
+# put a *previous* catalog into every prompt.
+_catalog_render_cache: Dict[int, Tuple[List[Dict], str]] = {}
+
+
+def _render_catalog(catalog: List[Dict]) -> str:
+    """Return (and cache) the catalog formatted for the prompt."""
+    key = id(catalog)
+    entry = _catalog_render_cache.get(key)
+    if entry is not None and entry[0] is catalog:
+        return entry[1]
+    rendered = "\n".join(
         f"- {s['catalog_id']}: \"{s['title']}\" (Writers: {s['writers']})"
         for s in catalog
     )
+    _catalog_render_cache[key] = (catalog, rendered)
+    return rendered
+
+
+# Fixed prompt blocks built once at import — only the track name(s) and
+# the (memoized) catalog render vary per call, so prompt construction is
+# a couple of interpolations instead of re-assembling these every time.
+_MATCH_SCHEMA_BLOCK = (
+    'Return JSON with this exact structure:\n'
+    '{"matches": [{"catalog_id": "CAT-XXX or None", '
+    '"confidence": "High/Review/None", '
+    '"reasoning": "brief explanation"}]}\n\n'
+    'If this is a medley, include one entry per song in the medley.\n'
+    'If no match or it\'s a cover, return: '
+    '{"matches": [{"catalog_id": "None", "confidence": "None", '
+    '"reasoning": "explanation"}]}'
+)
+
+_BATCH_SCHEMA_BLOCK = (
+    'Return JSON with this exact structure:\n'
+    '{"results": [{"id": 0, "matches": [{"catalog_id": "CAT-XXX or None", '
+    '"confidence": "High/Review/None", '
+    '"reasoning": "brief explanation"}]}, ...]}\n\n'
+    'Include one entry in "results" for EVERY track id above.\n'
+    'If a track has no match or is a cover, use '
+    '{"catalog_id": "None", "confidence": "None", "reasoning": "explanation"}.'
+)
+
+
+def _build_user_prompt(track_name: str, catalog: List[Dict]) -> str:
+    """Build the user prompt for the LLM call."""
+    catalog_list = _render_catalog(catalog)
 
     # Detect medley
     is_medley = "/" in track_name
@@ -96,45 +388,79 @@ def _build_user_prompt(track_name: str, catalog: List[Dict]) -> str:
         f'SETLIST TRACK: "{track_name}"\n'
         f'{medley_instruction}\n\n'
         f'OUR CATALOG:\n{catalog_list}\n\n'
-        f'Return JSON with this exact structure:\n'
-        f'{{"matches": [{{"catalog_id": "CAT-XXX or None", '
-        f'"confidence": "High/Review/None", '
-        f'"reasoning": "brief explanation"}}]}}\n\n'
-        f'If this is a medley, include one entry per song in the medley.\n'
-        f'If no match or it\'s a cover, return: '
-        f'{{"matches": [{{"catalog_id": "None", "confidence": "None", '
-        f'"reasoning": "explanation"}}]}}'
+        f'{_MATCH_SCHEMA_BLOCK}'
+    )
+
+
+def _build_batch_user_prompt(track_names: List[str], catalog: List[Dict]) -> str:
+    """Build the user prompt for a batched (multi-track) LLM call."""
+    tracks_json = json.dumps(
+        [{"id": i, "name": name} for i, name in enumerate(track_names)]
+    )
+
+    return (
+        f'Match each of these setlist tracks against our catalog:\n\n'
+        f'SETLIST TRACKS: {tracks_json}\n\n'
+        f'OUR CATALOG:\n{_render_catalog(catalog)}\n\n'
+        f'{_BATCH_SCHEMA_BLOCK}'
     )
 
 
 # ── Core LLM call ────────────────────────────────────────
 
+def _request_kwargs(user_prompt: str) -> Dict:
+    """Build the chat-completion arguments shared by all call paths."""
+    return {
+        "model": LLM_MODEL,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ],
+        "temperature": LLM_TEMPERATURE,
+        "response_format": {"type": "json_object"},
+    }
+
+
+@functools.lru_cache(maxsize=256)
 def _parse_llm_response(raw: str) -> List[Dict]:
     """
     Parse the LLM JSON response into a list of match dicts.
 
-    Handles several response shapes the LLM might produce:
-    - {"matches": [...]}
-    - {"results": [...]} or {"data": [...]}
-    - A bare list [...]
-    - A single dict with "catalog_id"
+    The prompt instructs the model to return {"matches": [...]}, so
+    that shape is the fast path; anything else falls through to the
+    slow schema-guessing branch.  Memoized on the raw string — at
+    temperature 0 identical tracks produce identical responses, and
+    callers never mutate the parsed matches.
     """
-    parsed = json.loads(raw)
+    parsed = _loads(raw)
+
+    if isinstance(parsed, dict):
+        matches = parsed.get("matches")
+        if isinstance(matches, list):
+            return matches
+        return _parse_llm_response_slow(parsed)
 
     if isinstance(parsed, list):
         return parsed
 
-    if isinstance(parsed, dict):
-        for key in ("matches", "results", "data"):
-            if key in parsed and isinstance(parsed[key], list):
-                return parsed[key]
-        if "catalog_id" in parsed:
-            return [parsed]
-        # Last resort: look for any list value
-        for val in parsed.values():
-            if isinstance(val, list):
-                return val
+    return []
 
+
+def _parse_llm_response_slow(parsed: Dict) -> List[Dict]:
+    """
+    Recover matches from off-spec response shapes:
+    - {"results": [...]} or {"data": [...]}
+    - A single dict with "catalog_id"
+    - Any dict with a list value, as a last resort
+    """
+    for key in ("results", "data"):
+        if isinstance(parsed.get(key), list):
+            return parsed[key]
+    if "catalog_id" in parsed:
+        return [parsed]
+    for val in parsed.values():
+        if isinstance(val, list):
+            return val
     return []
 
 
@@ -159,57 +485,303 @@ def llm_fuzzy_match(
 
     # Check cache first
     key = _cache_key(track_name)
-    if key in _match_cache:
-        logger.info("Cache hit for '%s'", track_name)
-        return _match_cache[key]
+    with _cache_lock:
+        _load_cache()
+        if key in _match_cache:
+            logger.info("Cache hit for '%s'", track_name)
+            return _match_cache[key]
+
+    # Known covers resolve locally, no API round-trip needed
+    cover = _known_cover_result(track_name)
+    if cover is not None:
+        with _cache_lock:
+            _match_cache[key] = cover
+        return cover
 
     catalog_ids = {s["catalog_id"] for s in catalog}
     user_prompt = _build_user_prompt(track_name, catalog)
 
-    # Rate limit: pause between consecutive LLM calls to avoid 429 errors
-    if RATE_LIMIT_DELAY > 0:
-        time.sleep(RATE_LIMIT_DELAY)
-
     last_error: Optional[str] = None
+    rate_limited = False
+    retry_after: Optional[float] = None
     for attempt in range(max_retries + 1):
         try:
-            response = client.chat.completions.create(
-                model=LLM_MODEL,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=LLM_TEMPERATURE,
-                response_format={"type": "json_object"},
-            )
+            # Rate limit: adaptive spacing, then cap in-flight requests
+            _rate_controller.await_slot()
+            with _rate_limiter:
+                response = client.chat.completions.create(
+                    **_request_kwargs(user_prompt)
+                )
+            _rate_controller.record(200)
 
             raw = response.choices[0].message.content.strip()
             matches = _parse_llm_response(raw)
 
-            if not matches:
-                matches = [{"catalog_id": "None", "confidence": "None",
-                            "reasoning": "Unparseable response"}]
-
-            validated = [validate_match(m, catalog_ids) for m in matches]
+            if matches:
+                validated = [validate_match(m, catalog_ids) for m in matches]
+            else:
+                # Built after validation so the sentinel survives
+                # (validate_match strips reasoning) and save_cache can
+                # exclude it — the track retries next run.
+                validated = [{"catalog_id": "None", "confidence": "None",
+                              "reasoning": _UNPARSEABLE}]
 
             # Store in cache
-            _match_cache[key] = validated
+            with _cache_lock:
+                _match_cache[key] = validated
             return validated
 
         except json.JSONDecodeError as exc:
+            rate_limited = False
+            retry_after = None
             last_error = f"Invalid JSON from LLM: {exc}"
             logger.warning("Attempt %d: %s", attempt + 1, last_error)
+        except RateLimitError as exc:
+            rate_limited = True
+            retry_after = _retry_after_seconds(exc)
+            _rate_controller.record(429)
+            last_error = f"Rate limited: {exc}"
+            logger.warning("Attempt %d: %s", attempt + 1, last_error)
         except Exception as exc:
+            rate_limited = False
+            retry_after = None
             last_error = f"API error: {exc}"
             logger.warning("Attempt %d: %s", attempt + 1, last_error)
 
         if attempt < max_retries:
-            _backoff_sleep(attempt)
+            if retry_after is not None:
+                logger.info("Server hinted retry-after %.1fs", retry_after)
+                time.sleep(min(retry_after, BACKOFF_MAX))
+            else:
+                _backoff_sleep(attempt, rate_limited)
 
     # All retries exhausted
     logger.error(
         "LLM matching failed after %d attempts: %s", max_retries + 1, last_error
     )
-    fallback = [{"catalog_id": "None", "confidence": "None"}]
-    _match_cache[key] = fallback
+    fallback = [{"catalog_id": "None", "confidence": "None",
+                 "reasoning": _RETRIES_EXHAUSTED}]
+    with _cache_lock:
+        _match_cache[key] = fallback
     return fallback
+
+
+async def llm_fuzzy_match_async(
+    track_name: str,
+    catalog: List[Dict],
+    client: AsyncOpenAI,
+    max_retries: Optional[int] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[Dict]:
+    """
+    Async counterpart of llm_fuzzy_match for AsyncOpenAI callers.
+
+    Lets a caller overlap dozens of unmatched tracks on one event loop
+    via asyncio.gather, with an optional asyncio.Semaphore capping
+    in-flight requests.  Shares the cache, validation, and backoff
+    behavior of the sync path.
+    """
+    if max_retries is None:
+        max_retries = MAX_RETRIES
+
+    key = _cache_key(track_name)
+    with _cache_lock:
+        _load_cache()
+        if key in _match_cache:
+            logger.info("Cache hit for '%s'", track_name)
+            return _match_cache[key]
+
+    cover = _known_cover_result(track_name)
+    if cover is not None:
+        with _cache_lock:
+            _match_cache[key] = cover
+        return cover
+
+    catalog_ids = {s["catalog_id"] for s in catalog}
+    user_prompt = _build_user_prompt(track_name, catalog)
+
+    last_error: Optional[str] = None
+    rate_limited = False
+    retry_after: Optional[float] = None
+    for attempt in range(max_retries + 1):
+        try:
+            delay = _rate_controller.throttle_delay()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if semaphore is not None:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        **_request_kwargs(user_prompt)
+                    )
+            else:
+                response = await client.chat.completions.create(
+                    **_request_kwargs(user_prompt)
+                )
+            _rate_controller.record(200)
+
+            raw = response.choices[0].message.content.strip()
+            matches = _parse_llm_response(raw)
+
+            if matches:
+                validated = [validate_match(m, catalog_ids) for m in matches]
+            else:
+                # Built after validation so the sentinel survives
+                # (validate_match strips reasoning) and save_cache can
+                # exclude it — the track retries next run.
+                validated = [{"catalog_id": "None", "confidence": "None",
+                              "reasoning": _UNPARSEABLE}]
+
+            with _cache_lock:
+                _match_cache[key] = validated
+            return validated
+
+        except json.JSONDecodeError as exc:
+            rate_limited = False
+            retry_after = None
+            last_error = f"Invalid JSON from LLM: {exc}"
+            logger.warning("Attempt %d: %s", attempt + 1, last_error)
+        except RateLimitError as exc:
+            rate_limited = True
+            retry_after = _retry_after_seconds(exc)
+            _rate_controller.record(429)
+            last_error = f"Rate limited: {exc}"
+            logger.warning("Attempt %d: %s", attempt + 1, last_error)
+        except Exception as exc:
+            rate_limited = False
+            retry_after = None
+            last_error = f"API error: {exc}"
+            logger.warning("Attempt %d: %s", attempt + 1, last_error)
+
+        if attempt < max_retries:
+            if retry_after is not None:
+                logger.info("Server hinted retry-after %.1fs", retry_after)
+                await asyncio.sleep(min(retry_after, BACKOFF_MAX))
+            else:
+                delay = _backoff_delay(attempt, rate_limited)
+                logger.info("Retrying in %.1fs (attempt %d)...", delay, attempt + 1)
+                await asyncio.sleep(delay)
+
+    logger.error(
+        "LLM matching failed after %d attempts: %s", max_retries + 1, last_error
+    )
+    fallback = [{"catalog_id": "None", "confidence": "None",
+                 "reasoning": _RETRIES_EXHAUSTED}]
+    with _cache_lock:
+        _match_cache[key] = fallback
+    return fallback
+
+
+def llm_fuzzy_match_batch(
+    track_names: List[str],
+    catalog: List[Dict],
+    client: OpenAI,
+    max_retries: Optional[int] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    Match several setlist tracks against the catalog in one LLM call.
+
+    The catalog dominates the prompt token count, so batching N tracks
+    per request amortizes it N ways — fewer round-trips, fewer tokens,
+    lower cost.  Cached tracks are resolved locally and excluded from
+    the request; results are cached per track like llm_fuzzy_match.
+
+    Returns a dict mapping each track name to its validated matches.
+    """
+    if max_retries is None:
+        max_retries = MAX_RETRIES
+
+    results: Dict[str, List[Dict]] = {}
+    pending: List[str] = []
+    with _cache_lock:
+        _load_cache()
+        for name in track_names:
+            cached = _match_cache.get(_cache_key(name))
+            if cached is None:
+                cached = _known_cover_result(name)
+                if cached is not None:
+                    _match_cache[_cache_key(name)] = cached
+            if cached is not None:
+                logger.info("Resolved '%s' locally", name)
+                results[name] = cached
+            elif name not in pending:
+                pending.append(name)
+
+    if not pending:
+        return results
+
+    catalog_ids = {s["catalog_id"] for s in catalog}
+    user_prompt = _build_batch_user_prompt(pending, catalog)
+
+    last_error: Optional[str] = None
+    rate_limited = False
+    retry_after: Optional[float] = None
+    for attempt in range(max_retries + 1):
+        try:
+            _rate_controller.await_slot()
+            with _rate_limiter:
+                response = client.chat.completions.create(
+                    **_request_kwargs(user_prompt)
+                )
+            _rate_controller.record(200)
+
+            raw = response.choices[0].message.content.strip()
+            parsed = _loads(raw)
+            entries = parsed.get("results") if isinstance(parsed, dict) else None
+            if not isinstance(entries, list):
+                raise ValueError("Batch response missing 'results' list")
+
+            matches_by_id: Dict[int, List[Dict]] = {}
+            for entry in entries:
+                if isinstance(entry, dict) and isinstance(entry.get("matches"), list):
+                    matches_by_id[entry.get("id")] = entry["matches"]
+
+            with _cache_lock:
+                for i, name in enumerate(pending):
+                    matches = matches_by_id.get(i)
+                    if matches:
+                        validated = [validate_match(m, catalog_ids) for m in matches]
+                    else:
+                        # Built after validation so the sentinel survives
+                        # (validate_match strips reasoning) and save_cache
+                        # can exclude it — the track retries next run.
+                        validated = [{"catalog_id": "None", "confidence": "None",
+                                      "reasoning": _MISSING_FROM_BATCH}]
+                    _match_cache[_cache_key(name)] = validated
+                    results[name] = validated
+            return results
+
+        except json.JSONDecodeError as exc:
+            rate_limited = False
+            retry_after = None
+            last_error = f"Invalid JSON from LLM: {exc}"
+            logger.warning("Attempt %d: %s", attempt + 1, last_error)
+        except RateLimitError as exc:
+            rate_limited = True
+            retry_after = _retry_after_seconds(exc)
+            _rate_controller.record(429)
+            last_error = f"Rate limited: {exc}"
+            logger.warning("Attempt %d: %s", attempt + 1, last_error)
+        except Exception as exc:
+            rate_limited = False
+            retry_after = None
+            last_error = f"API error: {exc}"
+            logger.warning("Attempt %d: %s", attempt + 1, last_error)
+
+        if attempt < max_retries:
+            if retry_after is not None:
+                logger.info("Server hinted retry-after %.1fs", retry_after)
+                time.sleep(min(retry_after, BACKOFF_MAX))
+            else:
+                _backoff_sleep(attempt, rate_limited)
+
+    # All retries exhausted — every pending track gets the fallback
+    logger.error(
+        "Batch LLM matching failed after %d attempts: %s", max_retries + 1, last_error
+    )
+    with _cache_lock:
+        for name in pending:
+            fallback = [{"catalog_id": "None", "confidence": "None",
+                         "reasoning": _RETRIES_EXHAUSTED}]
+            _match_cache[_cache_key(name)] = fallback
+            results[name] = fallback
+    return results
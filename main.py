@@ -15,6 +15,7 @@ import sys
 from config import setup_logging, validate_config, ConfigurationError
 from ingestion import fetch_tour_data, load_catalog, flatten_setlists
 from reconciler import reconcile
+from llm_matching import save_cache
 from output import write_csv
 
 logger = logging.getLogger(__name__)
@@ -50,26 +51,32 @@ def main() -> None:
     # Step 3: Run reconciliation pipeline
     logger.info("[3] Matching tracks...")
     results = reconcile(tracks, catalog)
+    save_cache()  # persist LLM results so reruns skip the API
 
     # Step 4: Output CSV
     logger.info("[4] Writing output...")
     write_csv(results)
 
-    # Step 5: Display results
-    logger.info("")
-    logger.info("=" * 55)
-    logger.info("  RESULTS")
-    logger.info("=" * 55)
-    logger.info("  %-35s %-15s %-25s %s", "Track", "Catalog ID", "Matched Title", "Confidence")
-    logger.info("  %s %s %s %s", "-" * 35, "-" * 15, "-" * 25, "-" * 12)
-    for r in results:
-        logger.info(
-            "  %-35s %-15s %-25s %s",
+    # Step 5: Display results — built as one string so the logging
+    # machinery formats and emits a single record instead of one per row
+    lines = [
+        "",
+        "=" * 55,
+        "  RESULTS",
+        "=" * 55,
+        "  %-35s %-15s %-25s %s" % ("Track", "Catalog ID", "Matched Title", "Confidence"),
+        "  %s %s %s %s" % ("-" * 35, "-" * 15, "-" * 25, "-" * 12),
+    ]
+    lines.extend(
+        "  %-35s %-15s %-25s %s" % (
             r["setlist_track_name"],
             r["matched_catalog_id"],
             r.get("matched_catalog_title", ""),
             r["match_confidence"],
         )
+        for r in results
+    )
+    logger.info("\n".join(lines))
 
     logger.info("Done.")
 
@@ -5,35 +5,85 @@ Stage 1 of the two-stage pipeline: free, instant, and 100% reliable.
 Handles exact matches (case-insensitive) and suffix-stripped matches.
 """
 
+import functools
 import logging
 import re
 from typing import Dict, List, Optional, Set, Tuple
 
-from config import VALID_CONFIDENCE
+try:
+    # Optional Stage 1.5: rapidfuzz's C-accelerated scorers resolve
+    # simple typos locally in microseconds, sparing an LLM round-trip.
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    _rf_fuzz = None
+    _rf_process = None
+
+from config import FUZZY_SCORE_CUTOFF, VALID_CONFIDENCE
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import — normalize() runs in every matching hot
+# path, so skipping the re-cache lookup per call adds up.  The negated
+# class [^)]* scans each parenthetical in one pass with no lazy
+# backtracking.
+_PAREN_RE = re.compile(r'\s*\([^)]*\)\s*')
+_WS_RE = re.compile(r'\s+')
+
 
+@functools.lru_cache(maxsize=4096)
 def normalize(text: str) -> str:
     """
     Normalize a string for comparison.
 
     Strips common live performance suffixes like (Acoustic),
     (Extended Jam), (Live), etc.  Then lowercases and collapses
-    whitespace.
+    whitespace.  Results are memoized since the same track names
+    recur across shows.
+    """
+    # Remove parenthetical suffixes, lowercase, collapse whitespace
+    return _WS_RE.sub(' ', _PAREN_RE.sub(' ', text).lower().strip())
+
+
+def build_catalog_index(catalog: List[Dict]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Precompute lookup tables for deterministic matching.
+
+    Returns two dicts mapping lowercased and normalized titles to
+    catalog IDs, so each track lookup is O(1) instead of a full
+    catalog scan with per-song regex work.  First occurrence wins,
+    matching the original scan order.
     """
-    # Remove parenthetical suffixes
-    text = re.sub(r'\s*\(.*?\)\s*', ' ', text)
-    # Lowercase + strip
-    text = text.lower().strip()
-    # Collapse multiple spaces
-    text = re.sub(r'\s+', ' ', text)
-    return text
+    lower_index: Dict[str, str] = {}
+    norm_index: Dict[str, str] = {}
+    for song in catalog:
+        lower_index.setdefault(song["title"].lower().strip(), song["catalog_id"])
+        norm_index.setdefault(normalize(song["title"]), song["catalog_id"])
+    return lower_index, norm_index
+
+
+# Memoized indexes keyed on id(catalog).  Each entry also holds a
+# strong reference to the catalog object itself: lists aren't
+# weakref-able, and without the pin CPython could reuse the id for a
+# new catalog after the old one is collected, serving a stale index.
+_index_cache: Dict[int, Tuple[List[Dict], Tuple[Dict[str, str], Dict[str, str]]]] = {}
+
+
+def _catalog_index(catalog: List[Dict]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Return (and cache) the prebuilt index for a catalog."""
+    key = id(catalog)
+    entry = _index_cache.get(key)
+    if entry is not None and entry[0] is catalog:
+        return entry[1]
+    index = build_catalog_index(catalog)
+    _index_cache[key] = (catalog, index)
+    return index
 
 
 def deterministic_match(
     track_name: str,
     catalog: List[Dict],
+    index: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None,
 ) -> Tuple[Optional[str], Optional[str]]:
     """
     Try to match a setlist track to the catalog using code logic.
@@ -42,22 +92,73 @@ def deterministic_match(
       1a. Exact match (case-insensitive)
       1b. Normalized match (strip suffixes like "(Acoustic)")
 
+    Callers doing many lookups can pass a prebuilt index from
+    build_catalog_index(); otherwise one is built and memoized
+    per catalog.
+
     Returns (catalog_id, confidence) or (None, None) if no match.
     """
-    normalized_track = normalize(track_name)
+    if index is None:
+        index = _catalog_index(catalog)
+    lower_index, norm_index = index
 
-    for song in catalog:
-        # Stage 1a: Exact match (case-insensitive)
-        if track_name.lower().strip() == song["title"].lower().strip():
-            return song["catalog_id"], "Exact"
+    # Stage 1a: Exact match (case-insensitive)
+    catalog_id = lower_index.get(track_name.lower().strip())
+    if catalog_id:
+        return catalog_id, "Exact"
 
-        # Stage 1b: Normalized match (strip suffixes)
-        if normalized_track == normalize(song["title"]):
-            return song["catalog_id"], "Exact"
+    # Stage 1b: Normalized match (strip suffixes)
+    catalog_id = norm_index.get(normalize(track_name))
+    if catalog_id:
+        return catalog_id, "Exact"
 
     return None, None
 
 
+def fuzzy_match(
+    track_name: str,
+    catalog: List[Dict],
+    index: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Stage 1.5: fuzzy-match a track against normalized catalog titles.
+
+    Catches simple typos and reorderings ("Midnite in Tokyo" →
+    "Midnight in Tokyo") with rapidfuzz's token_set_ratio, so only
+    genuinely ambiguous tracks escalate to the LLM.  The cutoff is
+    deliberately strict (FUZZY_SCORE_CUTOFF) — a near-miss here is
+    worth an LLM call, a wrong match is not.  token_set_ratio alone
+    scores 100 for any token subset ("Rain" → "Desert Rain"), so the
+    candidate must also clear the cutoff on plain fuzz.ratio; subsets
+    and abbreviations stay with the LLM, where a human-reviewable
+    confidence is assigned.
+
+    Returns (catalog_id, "High") on a confident hit, else (None, None).
+    No-op when rapidfuzz is not installed.
+    """
+    if _rf_process is None:
+        return None, None
+    if index is None:
+        index = _catalog_index(catalog)
+    _, norm_index = index
+
+    query = normalize(track_name)
+    best = _rf_process.extractOne(
+        query,
+        norm_index.keys(),
+        scorer=_rf_fuzz.token_set_ratio,
+        score_cutoff=FUZZY_SCORE_CUTOFF,
+    )
+    if best is None or _rf_fuzz.ratio(query, best[0]) < FUZZY_SCORE_CUTOFF:
+        return None, None
+    return norm_index[best[0]], "High"
+
+
+# Canonical "no match" result — copied (not shared) on return so
+# callers mutating one row can't corrupt the template.
+_INVALID = {"catalog_id": "None", "confidence": "None"}
+
+
 def validate_match(
     match: Dict,
     catalog_ids: Set[str],
@@ -78,8 +179,7 @@ def validate_match(
         logger.warning(
             "LLM returned invalid catalog_id '%s', setting to None", catalog_id
         )
-        catalog_id = "None"
-        confidence = "None"
+        return dict(_INVALID)
 
     # Validate confidence level
     if confidence not in VALID_CONFIDENCE:
@@ -4,12 +4,14 @@ Pipeline orchestration — wires ingestion, matching, and LLM together.
 
 import logging
 import os
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 
 from openai import OpenAI
 
-from matching import deterministic_match
-from llm_matching import llm_fuzzy_match
+from config import LLM_BATCH_SIZE, LLM_MAX_WORKERS
+from matching import build_catalog_index, deterministic_match, fuzzy_match
+from llm_matching import llm_fuzzy_match, llm_fuzzy_match_batch
 
 logger = logging.getLogger(__name__)
 
@@ -42,66 +44,105 @@ def reconcile(
                 "OPENAI_API_KEY not set — only deterministic matches will be attempted."
             )
 
-    results: List[Dict] = []
+    # Pass 1: Deterministic matching, then a fuzzy prefilter (Stage 1.5)
+    # for typo-level misses.  The same track name recurs across shows on
+    # a tour, so each unique name is resolved exactly once and the
+    # per-show rows are expanded from the result in pass 2.
+    # Medleys (contains "/") always go to the LLM.
+    stage1: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    llm_names: List[str] = []
     deterministic_hits = 0
-    llm_calls = 0
+    fuzzy_hits = 0
+    catalog_index = build_catalog_index(catalog)
+    id_to_title = {s["catalog_id"]: s["title"] for s in catalog}
 
     for track in tracks:
         track_name = track["setlist_track_name"]
-
-        # Medleys (contains "/") go straight to LLM
-        if "/" in track_name:
-            if client is None:
-                logger.info('[MEDLEY] "%s" → skipped (no API key)', track_name)
-                results.append(_result_row(track, "None", "None", catalog))
-                continue
-
-            logger.info('[MEDLEY] "%s" → sending to LLM', track_name)
-            llm_calls += 1
-            matches = llm_fuzzy_match(track_name, catalog, client)
-            logger.info(
-                "  Medley returned %d matches: %s",
-                len(matches),
-                [m.get("catalog_id") for m in matches],
-            )
-            for match in matches:
-                results.append(_result_row(
-                    track,
-                    match.get("catalog_id", "None"),
-                    match.get("confidence", "None"),
-                    catalog,
-                ))
+        if track_name in stage1:
             continue
 
-        # Stage 1: Deterministic match
-        catalog_id, confidence = deterministic_match(track_name, catalog)
+        if "/" in track_name:
+            catalog_id, confidence = None, None
+        else:
+            catalog_id, confidence = deterministic_match(track_name, catalog, catalog_index)
+            if catalog_id:
+                deterministic_hits += 1
+                logger.debug('[EXACT]  "%s" → %s', track_name, catalog_id)
+            else:
+                catalog_id, confidence = fuzzy_match(track_name, catalog, catalog_index)
+                if catalog_id:
+                    fuzzy_hits += 1
+                    logger.debug('[FUZZY]  "%s" → %s', track_name, catalog_id)
+        stage1[track_name] = (catalog_id, confidence)
+
+        if catalog_id is None and client is not None:
+            llm_names.append(track_name)
+
+    # Stage 2: LLM fuzzy matching — fan unique unmatched names out to a
+    # thread pool.  The calls are I/O-bound, so overlapping the HTTP
+    # round-trips gives near-linear speedup up to the worker cap.
+    # Plain tracks are grouped LLM_BATCH_SIZE per call to amortize the
+    # catalog tokens in the prompt; medleys keep their own per-track
+    # prompt with explicit split instructions.
+    llm_results: Dict[str, List[Dict]] = {}
+    if llm_names:
+        medley_names = [n for n in llm_names if "/" in n]
+        plain_names = [n for n in llm_names if "/" not in n]
+        batches = [
+            plain_names[i:i + LLM_BATCH_SIZE]
+            for i in range(0, len(plain_names), LLM_BATCH_SIZE)
+        ]
+        workers = min(LLM_MAX_WORKERS, len(medley_names) + len(batches))
+        logger.info("Sending %d unmatched tracks to LLM (%d batches + %d medleys, %d workers)",
+                    len(llm_names), len(batches), len(medley_names), workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            medley_futures = {
+                executor.submit(llm_fuzzy_match, name, catalog, client): name
+                for name in medley_names
+            }
+            batch_futures = [
+                executor.submit(llm_fuzzy_match_batch, batch, catalog, client)
+                for batch in batches
+            ]
+            for future in as_completed(medley_futures):
+                name = medley_futures[future]
+                llm_results[name] = future.result()
+            for future in batch_futures:
+                llm_results.update(future.result())
+
+    # Pass 2: Emit result rows in the original track order.
+    results: List[Dict] = []
+    for track in tracks:
+        track_name = track["setlist_track_name"]
+        catalog_id, confidence = stage1[track_name]
 
         if catalog_id:
-            deterministic_hits += 1
-            logger.info('[EXACT]  "%s" → %s', track_name, catalog_id)
-            results.append(_result_row(track, catalog_id, confidence, catalog))
+            results.append(_result_row(track, catalog_id, confidence, id_to_title))
             continue
 
-        # Stage 2: LLM fuzzy match
-        if client is None:
-            logger.info('[SKIP]   "%s" → no API key', track_name)
-            results.append(_result_row(track, "None", "None", catalog))
+        if track_name not in llm_results:
+            logger.debug('[SKIP]   "%s" → no API key', track_name)
+            results.append(_result_row(track, "None", "None", id_to_title))
             continue
 
-        llm_calls += 1
-        logger.info('[LLM]    "%s" → sending to LLM', track_name)
-        matches = llm_fuzzy_match(track_name, catalog, client)
+        matches = llm_results[track_name]
+        # Guarded so the per-track id lists aren't built unless DEBUG
+        # logging is actually on — at INFO only the summary line emits
+        if logger.isEnabledFor(logging.DEBUG):
+            tag = "[MEDLEY]" if "/" in track_name else "[LLM]   "
+            logger.debug('%s "%s" → %s', tag, track_name,
+                         [m.get("catalog_id") for m in matches])
 
         for match in matches:
             results.append(_result_row(
                 track,
                 match.get("catalog_id", "None"),
                 match.get("confidence", "None"),
-                catalog,
+                id_to_title,
             ))
 
-    logger.info("Match summary: deterministic=%d, llm_calls=%d, total_rows=%d",
-                deterministic_hits, llm_calls, len(results))
+    logger.info("Match summary (unique names): deterministic=%d, fuzzy=%d, llm=%d; total_rows=%d",
+                deterministic_hits, fuzzy_hits, len(llm_names), len(results))
     return results
 
 
@@ -109,16 +150,13 @@ def _result_row(
     track: dict,
     catalog_id: str,
     confidence: str,
-    catalog: List[Dict],
+    id_to_title: Dict[str, str],
 ) -> dict:
     """Build a single result row dict."""
     # Look up matched title for human-readable output
     matched_title = ""
     if catalog_id and catalog_id != "None":
-        for song in catalog:
-            if song["catalog_id"] == catalog_id:
-                matched_title = song["title"]
-                break
+        matched_title = id_to_title.get(catalog_id, "")
 
     return {
         "show_date": track["show_date"],
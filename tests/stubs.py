@@ -0,0 +1,50 @@
+"""
+Lightweight stand-ins for OpenAI response objects, shared by the
+mocked-LLM tests.
+
+dataclass(slots=True) attribute access is a single slot load, versus
+MagicMock's __getattr__ proxy chain, so each mocked round-trip costs
+almost nothing.
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass(slots=True)
+class LLMMessage:
+    content: str
+
+
+@dataclass(slots=True)
+class LLMChoice:
+    message: LLMMessage
+
+
+@dataclass(slots=True)
+class LLMResponse:
+    choices: List[LLMChoice]
+
+
+def llm_response(content: str) -> LLMResponse:
+    """Wrap raw content in the .choices[0].message.content shape."""
+    return LLMResponse([LLMChoice(LLMMessage(content))])
+
+
+try:
+    import orjson
+
+    def fingerprint(x) -> bytes:
+        """
+        Canonical byte fingerprint for structural comparisons.
+
+        Comparing fingerprints replaces a Python-level walk over nested
+        dicts/lists with a single memcmp on the serialized bytes.
+        """
+        return orjson.dumps(x, option=orjson.OPT_SORT_KEYS)
+except ImportError:
+    import json
+
+    def fingerprint(x) -> bytes:
+        """Canonical byte fingerprint for structural comparisons."""
+        return json.dumps(x, sort_keys=True).encode()
@@ -5,72 +5,97 @@ Covers response parsing, medley handling, cover detection,
 retry behavior, and the in-memory cache.
 """
 
+import asyncio
 import json
-import sys
-import os
 import unittest
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Ensure project root is on the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
+
+try:
+    # Mirror the optional fast path used by the modules under test —
+    # the mocked-LLM tests serialize a payload per call
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
+from tests.stubs import fingerprint, llm_response
 
 from llm_matching import (
+    RateController,
     llm_fuzzy_match,
+    llm_fuzzy_match_async,
+    llm_fuzzy_match_batch,
     _parse_llm_response,
+    _retry_after_seconds,
     clear_cache,
+    save_cache,
 )
 
 
 # ── Sample catalog ────────────────────────────────────────
 
-SAMPLE_CATALOG = [
+# A tuple, so the object is immutable and keeps one identity for the
+# whole run — matching memoizes its normalized-title index per catalog
+# object, so every test after the first gets plain dict lookups.
+SAMPLE_CATALOG = (
     {"catalog_id": "CAT-001", "title": "Neon Dreams", "writers": "Alex Park"},
     {"catalog_id": "CAT-002", "title": "Midnight in Tokyo", "writers": "Alex Park; Jane Miller"},
     {"catalog_id": "CAT-004", "title": "Desert Rain", "writers": "Leyla Ademi"},
     {"catalog_id": "CAT-005", "title": "Ocean Avenue", "writers": "Leyla Ademi"},
-]
+)
 
 
-def _mock_client(response_json: str) -> MagicMock:
-    """Create a mock OpenAI client that returns the given JSON string."""
-    client = MagicMock()
-    choice = MagicMock()
-    choice.message.content = response_json
-    client.chat.completions.create.return_value = MagicMock(
-        choices=[choice]
-    )
-    return client
+class _CreateStub:
+    """
+    Stand-in for client.chat.completions.create.
 
+    Takes a sequence of outcomes, one per call: a string becomes the
+    response content, an Exception instance is raised.  The last
+    outcome repeats once the sequence is exhausted.  Tracks call_count
+    like a MagicMock so existing assertions keep working.
+    """
 
-# ── _parse_llm_response() tests ──────────────────────────
+    def __init__(self, outcomes):
+        self._outcomes = list(outcomes)
+        self.call_count = 0
 
-class TestParseLLMResponse(unittest.TestCase):
+    def __call__(self, **kwargs):
+        index = min(self.call_count, len(self._outcomes) - 1)
+        self.call_count += 1
+        outcome = self._outcomes[index]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return llm_response(outcome)
 
-    def test_standard_matches_key(self):
-        raw = json.dumps({"matches": [{"catalog_id": "CAT-001", "confidence": "High"}]})
-        result = _parse_llm_response(raw)
-        self.assertEqual(len(result), 1)
-        self.assertEqual(result[0]["catalog_id"], "CAT-001")
 
-    def test_results_key(self):
-        raw = json.dumps({"results": [{"catalog_id": "CAT-002", "confidence": "High"}]})
-        result = _parse_llm_response(raw)
-        self.assertEqual(len(result), 1)
+def _mock_client(*outcomes) -> SimpleNamespace:
+    """Create a stub OpenAI client yielding the given outcomes in order."""
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=_CreateStub(outcomes)))
+    )
 
-    def test_bare_list(self):
-        raw = json.dumps([{"catalog_id": "CAT-001", "confidence": "High"}])
-        result = _parse_llm_response(raw)
-        self.assertEqual(len(result), 1)
 
-    def test_single_dict_with_catalog_id(self):
-        raw = json.dumps({"catalog_id": "CAT-001", "confidence": "High"})
-        result = _parse_llm_response(raw)
-        self.assertEqual(len(result), 1)
+# ── _parse_llm_response() tests ──────────────────────────
 
-    def test_empty_object_returns_empty(self):
-        raw = json.dumps({"foo": "bar"})
-        result = _parse_llm_response(raw)
-        self.assertEqual(len(result), 0)
+@pytest.mark.parametrize("payload,expected_ids", [
+    pytest.param({"matches": [{"catalog_id": "CAT-001", "confidence": "High"}]},
+                 ["CAT-001"], id="standard-matches-key"),
+    pytest.param({"results": [{"catalog_id": "CAT-002", "confidence": "High"}]},
+                 ["CAT-002"], id="results-key"),
+    pytest.param([{"catalog_id": "CAT-001", "confidence": "High"}],
+                 ["CAT-001"], id="bare-list"),
+    pytest.param({"catalog_id": "CAT-001", "confidence": "High"},
+                 ["CAT-001"], id="single-dict"),
+    pytest.param({"foo": "bar"}, [], id="empty-object"),
+])
+def test_parse_llm_response(payload, expected_ids):
+    result = _parse_llm_response(_dumps(payload))
+    assert [m["catalog_id"] for m in result] == expected_ids
 
 
 # ── llm_fuzzy_match() tests (mocked) ────────────────────
@@ -81,7 +106,7 @@ class TestLLMFuzzyMatch(unittest.TestCase):
         clear_cache()
 
     def test_single_match(self):
-        response = json.dumps({"matches": [
+        response = _dumps({"matches": [
             {"catalog_id": "CAT-002", "confidence": "High", "reasoning": "abbreviation"}
         ]})
         client = _mock_client(response)
@@ -91,18 +116,19 @@ class TestLLMFuzzyMatch(unittest.TestCase):
         self.assertEqual(result[0]["confidence"], "High")
 
     def test_medley_split(self):
-        response = json.dumps({"matches": [
+        response = _dumps({"matches": [
             {"catalog_id": "CAT-004", "confidence": "High", "reasoning": "exact"},
             {"catalog_id": "CAT-005", "confidence": "High", "reasoning": "exact"},
         ]})
         client = _mock_client(response)
         result = llm_fuzzy_match("Desert Rain / Ocean Avenue", SAMPLE_CATALOG, client, max_retries=0)
-        self.assertEqual(len(result), 2)
-        self.assertEqual(result[0]["catalog_id"], "CAT-004")
-        self.assertEqual(result[1]["catalog_id"], "CAT-005")
+        self.assertEqual(fingerprint(result), fingerprint([
+            {"catalog_id": "CAT-004", "confidence": "High"},
+            {"catalog_id": "CAT-005", "confidence": "High"},
+        ]))
 
     def test_cover_detection(self):
-        response = json.dumps({"matches": [
+        response = _dumps({"matches": [
             {"catalog_id": "None", "confidence": "None", "reasoning": "Oasis cover"}
         ]})
         client = _mock_client(response)
@@ -112,24 +138,33 @@ class TestLLMFuzzyMatch(unittest.TestCase):
 
     @patch("llm_matching._backoff_sleep")  # Don't actually sleep in tests
     def test_retry_on_bad_json(self, mock_sleep):
-        client = MagicMock()
         # First call returns invalid JSON, second call succeeds
-        bad_choice = MagicMock()
-        bad_choice.message.content = "not json at all"
-        good_choice = MagicMock()
-        good_choice.message.content = json.dumps(
-            {"matches": [{"catalog_id": "CAT-001", "confidence": "High"}]}
+        client = _mock_client(
+            "not json at all",
+            _dumps({"matches": [{"catalog_id": "CAT-001", "confidence": "High"}]}),
         )
-        client.chat.completions.create.side_effect = [
-            MagicMock(choices=[bad_choice]),
-            MagicMock(choices=[good_choice]),
-        ]
         result = llm_fuzzy_match("Neon Dreams", SAMPLE_CATALOG, client, max_retries=1)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["catalog_id"], "CAT-001")
 
+    def test_known_cover_skips_api_call(self):
+        client = _mock_client("should never be called")
+        result = llm_fuzzy_match("Wonderwall", SAMPLE_CATALOG, client, max_retries=0)
+        self.assertEqual(client.chat.completions.create.call_count, 0)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["catalog_id"], "None")
+        self.assertEqual(result[0]["confidence"], "None")
+
+    def test_misspelled_cover_still_goes_to_llm(self):
+        response = _dumps({"matches": [
+            {"catalog_id": "None", "confidence": "None", "reasoning": "Nirvana cover"}
+        ]})
+        client = _mock_client(response)
+        llm_fuzzy_match("Smsls Lk Tn Sprt", SAMPLE_CATALOG, client, max_retries=0)
+        self.assertEqual(client.chat.completions.create.call_count, 1)
+
     def test_cache_hit_skips_api_call(self):
-        response = json.dumps({"matches": [
+        response = _dumps({"matches": [
             {"catalog_id": "CAT-001", "confidence": "High", "reasoning": "exact"}
         ]})
         client = _mock_client(response)
@@ -138,20 +173,227 @@ class TestLLMFuzzyMatch(unittest.TestCase):
         result1 = llm_fuzzy_match("Neon Dreams", SAMPLE_CATALOG, client, max_retries=0)
         self.assertEqual(client.chat.completions.create.call_count, 1)
 
-        # Second call — should use cache, no new API call
+        # Second call — should use cache, no new API call.  The cache
+        # stores by reference, so the hit is the very same object
         result2 = llm_fuzzy_match("Neon Dreams", SAMPLE_CATALOG, client, max_retries=0)
         self.assertEqual(client.chat.completions.create.call_count, 1)  # Still 1
-        self.assertEqual(result1, result2)
+        self.assertIs(result1, result2)
 
     @patch("llm_matching._backoff_sleep")
     def test_all_retries_exhausted_returns_fallback(self, mock_sleep):
-        client = MagicMock()
-        client.chat.completions.create.side_effect = Exception("API down")
+        client = _mock_client(Exception("API down"))
         result = llm_fuzzy_match("Some Track", SAMPLE_CATALOG, client, max_retries=2)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["catalog_id"], "None")
         self.assertEqual(result[0]["confidence"], "None")
 
 
+@patch("llm_matching._backoff_sleep")
+def test_retry_exhausted_fallback_not_persisted(mock_sleep, tmp_path, monkeypatch):
+    # One API outage must not permanently record tracks as unmatched —
+    # real matches persist, retry-exhausted fallbacks do not.
+    clear_cache()
+    cache_file = tmp_path / "llm_cache.json"
+    monkeypatch.setattr("llm_matching.LLM_CACHE_FILE", cache_file)
+
+    good = _dumps({"matches": [
+        {"catalog_id": "CAT-001", "confidence": "High", "reasoning": "exact"}
+    ]})
+    llm_fuzzy_match("Neon Dreams", SAMPLE_CATALOG, _mock_client(good), max_retries=0)
+    llm_fuzzy_match(
+        "Some Track", SAMPLE_CATALOG, _mock_client(Exception("API down")), max_retries=1
+    )
+
+    save_cache()
+    persisted = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert len(persisted) == 1
+    (matches,) = persisted.values()
+    assert matches[0]["catalog_id"] == "CAT-001"
+
+
+def test_unparseable_fallback_not_persisted(tmp_path, monkeypatch):
+    # Valid JSON with no recoverable matches is a one-off bad
+    # completion — it must not become a permanent on-disk verdict.
+    clear_cache()
+    cache_file = tmp_path / "llm_cache.json"
+    monkeypatch.setattr("llm_matching.LLM_CACHE_FILE", cache_file)
+
+    result = llm_fuzzy_match(
+        "Some Track", SAMPLE_CATALOG, _mock_client(_dumps({"foo": "bar"})),
+        max_retries=0,
+    )
+    assert result[0]["catalog_id"] == "None"
+
+    save_cache()
+    assert json.loads(cache_file.read_text(encoding="utf-8")) == {}
+
+
+# ── _retry_after_seconds() tests ─────────────────────────
+
+class TestRetryAfterSeconds(unittest.TestCase):
+
+    def test_reads_retry_after_ms(self):
+        exc = SimpleNamespace(response=SimpleNamespace(
+            headers={"retry-after-ms": "1500"}
+        ))
+        self.assertEqual(_retry_after_seconds(exc), 1.5)
+
+    def test_reads_retry_after_seconds(self):
+        exc = SimpleNamespace(response=SimpleNamespace(
+            headers={"retry-after": "2"}
+        ))
+        self.assertEqual(_retry_after_seconds(exc), 2.0)
+
+    def test_no_headers_returns_none(self):
+        self.assertIsNone(_retry_after_seconds(Exception("boom")))
+
+    def test_unparseable_value_returns_none(self):
+        exc = SimpleNamespace(response=SimpleNamespace(
+            headers={"retry-after": "soon"}
+        ))
+        self.assertIsNone(_retry_after_seconds(exc))
+
+
+# ── RateController tests ─────────────────────────────────
+
+class TestRateController(unittest.TestCase):
+
+    def test_no_delay_while_requests_succeed(self):
+        controller = RateController(base_delay=0.1)
+        for _ in range(10):
+            controller.record(200)
+        self.assertEqual(controller.throttle_delay(), 0.0)
+
+    def test_delay_grows_with_429_rate(self):
+        controller = RateController(base_delay=0.1)
+        for _ in range(5):
+            controller.record(200)
+        controller.record(429)
+        mild = controller.throttle_delay()
+        for _ in range(10):
+            controller.record(429)
+        severe = controller.throttle_delay()
+        self.assertGreater(mild, 0.0)
+        self.assertGreater(severe, mild)
+
+    def test_empty_window_means_no_delay(self):
+        controller = RateController(base_delay=0.1)
+        self.assertEqual(controller.throttle_delay(), 0.0)
+
+
+# ── llm_fuzzy_match_async() tests (mocked) ──────────────
+
+class TestLLMFuzzyMatchAsync(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+
+    def test_async_match_and_cache(self):
+        response = _dumps({"matches": [
+            {"catalog_id": "CAT-002", "confidence": "High", "reasoning": "abbreviation"}
+        ]})
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return llm_response(response)
+
+        client = SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+        )
+
+        async def run():
+            first = await llm_fuzzy_match_async(
+                "Tokyo (Acoustic)", SAMPLE_CATALOG, client, max_retries=0
+            )
+            second = await llm_fuzzy_match_async(
+                "Tokyo (Acoustic)", SAMPLE_CATALOG, client, max_retries=0
+            )
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first[0]["catalog_id"], "CAT-002")
+        self.assertEqual(fingerprint(first), fingerprint(second))
+        self.assertEqual(len(calls), 1)  # Second call served from cache
+
+
+# ── llm_fuzzy_match_batch() tests (mocked) ──────────────
+
+class TestLLMFuzzyMatchBatch(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+
+    def test_batch_returns_match_per_track(self):
+        response = _dumps({"results": [
+            {"id": 0, "matches": [
+                {"catalog_id": "CAT-001", "confidence": "High", "reasoning": "exact"}
+            ]},
+            {"id": 1, "matches": [
+                {"catalog_id": "None", "confidence": "None", "reasoning": "Oasis cover"}
+            ]},
+        ]})
+        client = _mock_client(response)
+        result = llm_fuzzy_match_batch(
+            ["Neon Dreams", "Wonderwall"], SAMPLE_CATALOG, client, max_retries=0
+        )
+        self.assertEqual(client.chat.completions.create.call_count, 1)
+        self.assertEqual(result["Neon Dreams"][0]["catalog_id"], "CAT-001")
+        self.assertEqual(result["Wonderwall"][0]["catalog_id"], "None")
+
+    def test_batch_skips_cached_tracks(self):
+        single = _dumps({"matches": [
+            {"catalog_id": "CAT-001", "confidence": "High", "reasoning": "exact"}
+        ]})
+        client = _mock_client(single)
+        llm_fuzzy_match("Neon Dreams", SAMPLE_CATALOG, client, max_retries=0)
+        self.assertEqual(client.chat.completions.create.call_count, 1)
+
+        # Fully cached batch — no additional API call
+        result = llm_fuzzy_match_batch(
+            ["Neon Dreams"], SAMPLE_CATALOG, client, max_retries=0
+        )
+        self.assertEqual(client.chat.completions.create.call_count, 1)
+        self.assertEqual(result["Neon Dreams"][0]["catalog_id"], "CAT-001")
+
+    def test_batch_missing_entry_falls_back(self):
+        # Response covers id 0 only — id 1 should fall back to None/None
+        response = _dumps({"results": [
+            {"id": 0, "matches": [
+                {"catalog_id": "CAT-002", "confidence": "High", "reasoning": "abbrev"}
+            ]},
+        ]})
+        client = _mock_client(response)
+        result = llm_fuzzy_match_batch(
+            ["Tokyo (Acoustic)", "Mystery Track"], SAMPLE_CATALOG, client, max_retries=0
+        )
+        self.assertEqual(result["Tokyo (Acoustic)"][0]["catalog_id"], "CAT-002")
+        self.assertEqual(result["Mystery Track"][0]["catalog_id"], "None")
+
+
+def test_batch_missing_entry_not_persisted(tmp_path, monkeypatch):
+    # A track the model omits from a batch response is a flaky
+    # completion, not a verdict — it must retry on the next run.
+    clear_cache()
+    cache_file = tmp_path / "llm_cache.json"
+    monkeypatch.setattr("llm_matching.LLM_CACHE_FILE", cache_file)
+
+    response = _dumps({"results": [
+        {"id": 0, "matches": [
+            {"catalog_id": "CAT-001", "confidence": "High", "reasoning": "exact"}
+        ]},
+    ]})
+    llm_fuzzy_match_batch(
+        ["Neon Dreams", "Mystery Track"], SAMPLE_CATALOG,
+        _mock_client(response), max_retries=0,
+    )
+
+    save_cache()
+    persisted = json.loads(cache_file.read_text(encoding="utf-8"))
+    assert len(persisted) == 1
+    (matches,) = persisted.values()
+    assert matches[0]["catalog_id"] == "CAT-001"
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,53 +4,44 @@ Unit tests for the deterministic matching module.
 Covers normalize(), deterministic_match(), and validate_match().
 """
 
-import sys
-import os
 import unittest
 
-# Ensure project root is on the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import pytest
 
-from matching import normalize, deterministic_match, validate_match
+from matching import normalize, deterministic_match, fuzzy_match, validate_match
+from matching import _rf_process
 
 
 # ── Sample catalog for testing ────────────────────────────
 
-SAMPLE_CATALOG = [
+# A tuple, so the object is immutable and keeps one identity for the
+# whole run — deterministic_match/fuzzy_match memoize their lookup
+# index per catalog object, so tests hit the prebuilt index after the
+# first call instead of re-normalizing every title.
+SAMPLE_CATALOG = (
     {"catalog_id": "CAT-001", "title": "Neon Dreams", "writers": "Alex Park"},
     {"catalog_id": "CAT-002", "title": "Midnight in Tokyo", "writers": "Alex Park; Jane Miller"},
     {"catalog_id": "CAT-003", "title": "Shattered Glass", "writers": "Jane Miller"},
     {"catalog_id": "CAT-007", "title": "Velocity", "writers": "Paul Walker"},
     {"catalog_id": "CAT-006", "title": "Golden Gate", "writers": "Rachel Davis"},
-]
+)
 
-CATALOG_IDS = {s["catalog_id"] for s in SAMPLE_CATALOG}
+CATALOG_IDS = frozenset(s["catalog_id"] for s in SAMPLE_CATALOG)
 
 
 # ── normalize() tests ────────────────────────────────────
 
-class TestNormalize(unittest.TestCase):
-
-    def test_strips_parenthetical_suffix(self):
-        self.assertEqual(normalize("Tokyo (Acoustic)"), "tokyo")
-
-    def test_strips_multiple_parentheticals(self):
-        self.assertEqual(normalize("Song (Live) (Remix)"), "song")
-
-    def test_collapses_whitespace(self):
-        self.assertEqual(normalize("  hello   world  "), "hello world")
-
-    def test_lowercases(self):
-        self.assertEqual(normalize("NEON DREAMS"), "neon dreams")
-
-    def test_strips_extended_jam(self):
-        self.assertEqual(normalize("Velocity (Extended Jam)"), "velocity")
-
-    def test_plain_string_unchanged(self):
-        self.assertEqual(normalize("Golden Gate"), "golden gate")
-
-    def test_empty_string(self):
-        self.assertEqual(normalize(""), "")
+@pytest.mark.parametrize("text,expected", [
+    pytest.param("Tokyo (Acoustic)", "tokyo", id="strips-parenthetical-suffix"),
+    pytest.param("Song (Live) (Remix)", "song", id="strips-multiple-parentheticals"),
+    pytest.param("  hello   world  ", "hello world", id="collapses-whitespace"),
+    pytest.param("NEON DREAMS", "neon dreams", id="lowercases"),
+    pytest.param("Velocity (Extended Jam)", "velocity", id="strips-extended-jam"),
+    pytest.param("Golden Gate", "golden gate", id="plain-string-unchanged"),
+    pytest.param("", "", id="empty-string"),
+])
+def test_normalize(text, expected):
+    assert normalize(text) == expected
 
 
 # ── deterministic_match() tests ──────────────────────────
@@ -96,54 +87,61 @@ class TestDeterministicMatch(unittest.TestCase):
         self.assertIsNone(conf)
 
 
+# ── fuzzy_match() tests ──────────────────────────────────
+
+@unittest.skipIf(_rf_process is None, "rapidfuzz not installed")
+class TestFuzzyMatch(unittest.TestCase):
+
+    def test_matches_simple_typo(self):
+        cat_id, conf = fuzzy_match("Midnite in Tokyo", SAMPLE_CATALOG)
+        self.assertEqual(cat_id, "CAT-002")
+        self.assertEqual(conf, "High")
+
+    def test_token_subset_escalates(self):
+        # token_set_ratio scores any token subset at 100, but "Tokyo"
+        # could be its own song — a one-token query must not come back
+        # as a High match.  The fuzz.ratio guard sends it to the LLM.
+        cat_id, conf = fuzzy_match("Tokyo (Acoustic)", SAMPLE_CATALOG)
+        self.assertIsNone(cat_id)
+        self.assertIsNone(conf)
+
+    def test_single_token_of_longer_title_escalates(self):
+        cat_id, conf = fuzzy_match("Glass", SAMPLE_CATALOG)
+        self.assertIsNone(cat_id)
+        self.assertIsNone(conf)
+
+    def test_no_match_for_unrelated_title(self):
+        cat_id, conf = fuzzy_match("Wonderwall", SAMPLE_CATALOG)
+        self.assertIsNone(cat_id)
+        self.assertIsNone(conf)
+
+    def test_no_match_for_heavy_abbreviation(self):
+        # Vowel-stripped abbreviations score below the cutoff and must
+        # still escalate to the LLM
+        cat_id, conf = fuzzy_match("Smsls Lk Tn Sprt", SAMPLE_CATALOG)
+        self.assertIsNone(cat_id)
+        self.assertIsNone(conf)
+
+
 # ── validate_match() tests ───────────────────────────────
 
-class TestValidateMatch(unittest.TestCase):
-
-    def test_valid_match_passes_through(self):
-        result = validate_match(
-            {"catalog_id": "CAT-001", "confidence": "High"},
-            CATALOG_IDS,
-        )
-        self.assertEqual(result["catalog_id"], "CAT-001")
-        self.assertEqual(result["confidence"], "High")
-
-    def test_none_catalog_id_passes(self):
-        result = validate_match(
-            {"catalog_id": "None", "confidence": "None"},
-            CATALOG_IDS,
-        )
-        self.assertEqual(result["catalog_id"], "None")
-        self.assertEqual(result["confidence"], "None")
-
-    def test_invalid_catalog_id_corrected(self):
-        result = validate_match(
-            {"catalog_id": "CAT-999", "confidence": "High"},
-            CATALOG_IDS,
-        )
-        self.assertEqual(result["catalog_id"], "None")
-        self.assertEqual(result["confidence"], "None")
-
-    def test_invalid_confidence_corrected(self):
-        result = validate_match(
-            {"catalog_id": "CAT-001", "confidence": "Maybe"},
-            CATALOG_IDS,
-        )
-        self.assertEqual(result["catalog_id"], "CAT-001")
-        self.assertEqual(result["confidence"], "Review")
-
-    def test_missing_fields_default_to_none(self):
-        result = validate_match({}, CATALOG_IDS)
-        self.assertEqual(result["catalog_id"], "None")
-        self.assertEqual(result["confidence"], "None")
-
-    def test_whitespace_in_values_stripped(self):
-        result = validate_match(
-            {"catalog_id": " CAT-001 ", "confidence": " High "},
-            CATALOG_IDS,
-        )
-        self.assertEqual(result["catalog_id"], "CAT-001")
-        self.assertEqual(result["confidence"], "High")
+@pytest.mark.parametrize("match,expected_id,expected_confidence", [
+    pytest.param({"catalog_id": "CAT-001", "confidence": "High"},
+                 "CAT-001", "High", id="valid-passes-through"),
+    pytest.param({"catalog_id": "None", "confidence": "None"},
+                 "None", "None", id="none-id-passes"),
+    pytest.param({"catalog_id": "CAT-999", "confidence": "High"},
+                 "None", "None", id="invalid-id-corrected"),
+    pytest.param({"catalog_id": "CAT-001", "confidence": "Maybe"},
+                 "CAT-001", "Review", id="invalid-confidence-corrected"),
+    pytest.param({}, "None", "None", id="missing-fields-default"),
+    pytest.param({"catalog_id": " CAT-001 ", "confidence": " High "},
+                 "CAT-001", "High", id="whitespace-stripped"),
+])
+def test_validate_match(match, expected_id, expected_confidence):
+    result = validate_match(match, CATALOG_IDS)
+    assert result["catalog_id"] == expected_id
+    assert result["confidence"] == expected_confidence
 
 
 if __name__ == "__main__":